@@ -0,0 +1,121 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import matplotlib as mpl
+from PIL import Image
+
+# ----------------------------------------------------
+# Pipelined GIF rendering
+#
+#   draw (caller thread) -> quantize (worker threads) -> write (thread)
+#
+# The caller keeps drawing with matplotlib while earlier frames are being
+# converted to palette mode.  The queue between the stages is bounded, so
+# drawing blocks once `maxsize` raw RGBA frames are waiting.  The writer
+# hands the quantized frames to Pillow's Image.save(save_all=True), which
+# keeps every palette frame (1 byte per pixel) and only LZW-encodes and
+# writes the file once the last frame has arrived, i.e. in close().
+# ----------------------------------------------------
+
+# Same conversion Pillow's GIF plugin applies to RGB(A) frames on save
+def quantize(im, opaque_rgb=False):
+    if opaque_rgb and im.getextrema()[3][0] == 255:
+        # matplotlib's PillowWriter drops the alpha channel of opaque frames
+        im = im.convert("RGB")
+    im = im.convert("P", palette=Image.Palette.ADAPTIVE)
+    if im.palette.mode == "RGBA":
+        for rgba in im.palette.colors:
+            if rgba[3] == 0:
+                im.info["transparency"] = im.palette.colors[rgba]
+                break
+    return im
+
+
+class FramePipeline:
+    """Render matplotlib figures to an animated GIF in three stages.
+
+    Use as a context manager and call :meth:`add` once per frame; the GIF
+    is complete when the ``with`` block exits.  ``duration`` is the frame
+    time in milliseconds, ``savefig_kwargs`` are passed to every
+    ``fig.savefig`` call (e.g. ``dpi=150``).  ``opaque_rgb=True`` matches
+    the output of matplotlib's ``PillowWriter``.
+    """
+
+    _done = object()
+
+    def __init__(self, filename, duration, maxsize=8, workers=2,
+                 opaque_rgb=False, **savefig_kwargs):
+        if "bbox_inches" in savefig_kwargs:
+            raise ValueError("bbox_inches would change the frame size; "
+                             "fix the layout on the figure instead")
+        self.filename = filename
+        self.duration = duration
+        self.opaque_rgb = opaque_rgb
+        self.savefig_kwargs = savefig_kwargs
+
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._drained = False
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # don't let a writer error hide the exception raised in the block
+        self.close(raise_error=exc_type is None)
+
+    # Stage 1: runs in the caller's thread, since pyplot is not thread-safe
+    def add(self, fig):
+        if self._error is not None:
+            raise self._error
+        # resolve the dpi the way savefig does
+        dpi = self.savefig_kwargs.get("dpi", mpl.rcParams["savefig.dpi"])
+        if dpi == "figure":
+            dpi = fig.dpi
+        w, h = fig.get_size_inches()
+        size = (int(w*dpi), int(h*dpi))
+
+        buf = BytesIO()
+        fig.savefig(buf, **{**self.savefig_kwargs, "format": "rgba", "dpi": dpi})
+        if len(buf.getbuffer()) != size[0]*size[1]*4:
+            raise ValueError(f"rendered {len(buf.getbuffer())} bytes, expected "
+                             f"a {size[0]}x{size[1]} RGBA frame")
+        im = Image.frombuffer("RGBA", size, buf.getbuffer(), "raw", "RGBA", 0, 1)
+        # Futures are queued in submission order, so frame order is kept
+        # no matter which worker finishes first; put() blocks when full.
+        self._queue.put(self._pool.submit(quantize, im, self.opaque_rgb))
+
+    # Stage 2 results, consumed in order by the writer
+    def _frames(self):
+        while True:
+            fut = self._queue.get()
+            if fut is self._done:
+                self._drained = True
+                return
+            yield fut.result()
+
+    # Stage 3: Pillow collects the frames, then encodes the GIF at the end
+    def _write(self):
+        frames = self._frames()
+        try:
+            first = next(frames, None)
+            if first is not None:
+                first.save(self.filename, save_all=True, append_images=frames,
+                           duration=self.duration, loop=0)
+        except BaseException as e:
+            self._error = e
+            # keep draining so add() never blocks on a dead writer
+            while not self._drained:
+                self._drained = self._queue.get() is self._done
+
+    def close(self, raise_error=True):
+        self._queue.put(self._done)
+        self._writer.join()
+        self._pool.shutdown()
+        if raise_error and self._error is not None:
+            raise self._error
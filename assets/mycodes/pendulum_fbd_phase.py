@@ -1,7 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation, PillowWriter
 from scipy.integrate import solve_ivp
+from frame_pipeline import FramePipeline
 
 # ----------------------------------------------------
 # Physical parameters
@@ -209,20 +209,14 @@ def update(i):
             info_text)
 
 # ----------------------------------------------------
-# Animation
+# Save GIF (same frames and encoding as PillowWriter(fps=20))
 # ----------------------------------------------------
-ani = FuncAnimation(
-    fig, update,
-    frames=range(len(t)),
-    init_func=init,
-    blit=True
-)
-
-# ----------------------------------------------------
-# Save GIF
-# ----------------------------------------------------
-writer = PillowWriter(fps=20)
-ani.save("pendulum_phase_fbd_theta.gif", writer=writer)
+with FramePipeline("pendulum_phase_fbd_theta.gif", duration=int(1000/20),
+                   opaque_rgb=True) as pipeline:
+    init()
+    for i in range(len(t)):
+        update(i)
+        pipeline.add(fig)
 
 # plt.show()
 
@@ -0,0 +1,145 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.integrate import solve_ivp
+
+# ----------------------------------------------------
+# Physical parameters (same pendulum as pendulum_fbd_phase.py)
+# ----------------------------------------------------
+g = 9.81
+l = 0.9
+
+omega_0 = np.sqrt(g/l)          # small-angle natural frequency
+gamma = 0.5*omega_0             # damping rate (quality factor 2)
+Omega_d = (2/3)*omega_0         # drive frequency
+T_d = 2*np.pi/Omega_d           # drive period
+
+# Initial conditions
+theta0 = np.deg2rad(39.64)
+omega0 = -1.17
+
+# ----------------------------------------------------
+# Damped, periodically driven pendulum
+#   theta'' = -(g/l) sin(theta) - gamma*theta' + A cos(Omega_d t)
+# ----------------------------------------------------
+def driven_pendulum(t, y, A):
+    theta, omega = y
+    return [omega, -(g/l)*np.sin(theta) - gamma*omega + A*np.cos(Omega_d*t)]
+
+# Turning points (omega = 0, theta at a maximum) for event-based sections
+def turning_point(t, y, A):
+    return y[1]
+
+turning_point.direction = -1
+
+def wrap_angle(theta):
+    return (theta + np.pi) % (2*np.pi) - np.pi
+
+# ----------------------------------------------------
+# Poincaré section for one drive amplitude
+# ----------------------------------------------------
+def poincare_section(A, n_points=400, n_transient=200, section="strobe",
+                     y0=(theta0, omega0), rtol=1e-8, atol=1e-10):
+    """Return an (n_points, 2) float32 array of (theta, omega) section points.
+
+    ``section="strobe"`` samples once per drive period after ``n_transient``
+    periods; ``section="event"`` records turning points (omega crossing zero
+    downwards) found by ``solve_ivp`` event detection over the same window.
+    Rows that were not filled (events only) are NaN; a failed integration
+    raises ``RuntimeError``.
+    """
+    t_start = n_transient*T_d
+    t_stop = (n_transient + n_points)*T_d
+
+    if section == "strobe":
+        t_eval = t_start + T_d*np.arange(n_points)
+        sol = solve_ivp(driven_pendulum, [0, t_eval[-1]], y0, args=(A,),
+                        t_eval=t_eval, method="DOP853", rtol=rtol, atol=atol)
+    elif section == "event":
+        sol = solve_ivp(driven_pendulum, [0, t_stop], y0, args=(A,),
+                        events=turning_point, method="DOP853",
+                        rtol=rtol, atol=atol)
+    else:
+        raise ValueError(f"unknown section type {section!r}")
+
+    if sol.status < 0:
+        raise RuntimeError(f"integration failed for A={A}: {sol.message}")
+
+    if section == "strobe":
+        pts = sol.y.T
+    else:
+        pts = sol.y_events[0].reshape(-1, 2)[sol.t_events[0] >= t_start][:n_points]
+
+    out = np.full((n_points, 2), np.nan, dtype=np.float32)
+    out[:len(pts), 0] = wrap_angle(pts[:, 0])
+    out[:len(pts), 1] = pts[:, 1]
+    return out
+
+# ----------------------------------------------------
+# Parallel sweep over drive amplitudes
+# ----------------------------------------------------
+def sweep(amplitudes, path, n_points=400, n_transient=200, section="strobe",
+          workers=None):
+    """Compute sections for every amplitude in a process pool.
+
+    Results are written to ``path`` as an ``.npy`` memmap of shape
+    ``(len(amplitudes), n_points, 2)`` (float32) as soon as each worker
+    finishes, so memory use does not grow with the size of the sweep.
+    Rows not computed yet (e.g. after an interrupted run) are NaN.  If any
+    amplitude fails, the remaining work is cancelled and the error raised.
+    The amplitudes are stored next to it as ``<path>_amplitudes.npy``.
+    """
+    amplitudes = np.asarray(amplitudes, dtype=np.float64)
+    np.save(os.path.splitext(path)[0] + "_amplitudes.npy", amplitudes)
+
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32,
+                                    shape=(len(amplitudes), n_points, 2))
+    out[:] = np.nan
+    out.flush()
+    work = partial(poincare_section, n_points=n_points,
+                   n_transient=n_transient, section=section)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(work, A): i for i, A in enumerate(amplitudes)}
+        try:
+            for done, fut in enumerate(as_completed(futures), 1):
+                out[futures.pop(fut)] = fut.result()
+                if done % 50 == 0:
+                    out.flush()
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            out.flush()
+            raise
+
+    out.flush()
+    return out
+
+# ----------------------------------------------------
+# Bifurcation diagram
+# ----------------------------------------------------
+def plot_bifurcation(amplitudes, sections, filename):
+    A = np.repeat(amplitudes/omega_0**2, sections.shape[1])
+    theta = sections[:, :, 0].ravel()
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(A, theta, ',', color='k', alpha=0.5)
+    ax.set_xlim(A.min(), A.max())
+    ax.set_ylim(-np.pi, np.pi)
+    ax.set_xlabel(r'Drive amplitude $A/\omega_0^2$')
+    ax.set_ylabel(r'$\theta$ (rad)')
+    ax.set_title('Driven pendulum: Poincaré sections')
+    plt.savefig(filename, dpi=150)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    amplitudes = np.linspace(0.9, 1.5, 600)*omega_0**2
+
+    sections = sweep(amplitudes, "pendulum_poincare.npy")
+    plot_bifurcation(amplitudes, sections, "pendulum_bifurcation.png")
+
+    print("Sections saved as pendulum_poincare.npy")
+    print("Bifurcation diagram saved as pendulum_bifurcation.png")
@@ -1,14 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from PIL import Image
-import os
+from frame_pipeline import FramePipeline
 
 plt.style.use("ggplot")
 
-# Create temporary folder
-os.makedirs("frames", exist_ok=True)
-
 # Time-domain signal
 t = np.linspace(0, 10, 1000)
 signal = np.sin(2 * np.pi * 1 * t) + 0.5 * np.sin(2 * np.pi * 2 * t)
@@ -22,58 +18,45 @@ spectrum = spectrum / np.max(spectrum) * np.max(signal) * 1.2
 
 # Animation steps
 steps = 40
-frames = []
-
-for i in range(steps):
-    alpha = i / (steps - 1)
-
-    fig = plt.figure(figsize=(14, 6))
-
-    # --- Left subplot: 2D plots ---
-    ax1 = fig.add_subplot(121)
-    ax1.plot(t, signal, color='blue', lw=3, alpha=1 - alpha, label="Time Domain")
-    ax1.plot(freq[:len(freq)//2], spectrum[:len(freq)//2],
-             color='red', lw=2, alpha=alpha, label="Frequency Domain")
-    ax1.set_title("2D Comparison", fontsize=14, fontweight='bold')
-    ax1.set_xlabel("Time / Frequency")
-    ax1.set_ylabel("Amplitude / Magnitude")
-    ax1.set_ylim(-2.5, 2.5)
-    ax1.set_xlim(0, 12)
-    ax1.legend(fontsize=15)
-    ax1.grid(True, linestyle='--', alpha=0.6)
-
-    # --- Right subplot: 3D plot ---
-    ax2 = fig.add_subplot(122, projection='3d')
-    ax2.plot(t, signal * 2, zs=-2, zdir='y',
-             color='blue', alpha=1 - alpha, lw=2, label="Time Domain")
-    ax2.bar(freq[:len(freq)//2], spectrum[:len(freq)//2],
-            zs=2, zdir='y', color='red', alpha=alpha*0.8,
-            edgecolor='black', linewidth=0.8, label="Frequency Domain")
-    ax2.set_title("3D Transition", fontsize=14, fontweight='bold')
-    ax2.set_xlabel("Time / Frequency", fontsize=12)
-    ax2.set_ylim(-2.5, 2.5)
-    ax2.set_xlim(0, 12) 
-    ax2.set_ylabel("Domain", fontsize=12)
-    ax2.set_zlabel("Amplitude / Magnitude", fontsize=12)
-    ax2.view_init(elev=25, azim=30 + i)
-    ax2.legend(loc="upper left", fontsize=15)
-
-    plt.tight_layout()
-    filename = f"frames/frame_{i:03d}.png"
-    plt.savefig(filename, dpi=150)
-    plt.close()
-
-    frames.append(Image.open(filename))
-
-# Save GIF
-frames[0].save("fourier_transform_2D_3D.gif",
-               save_all=True, append_images=frames[1:],
-               duration=120, loop=0)
-
-# Cleanup
-for file in os.listdir("frames"):
-    os.remove(os.path.join("frames", file))
-os.rmdir("frames")
+with FramePipeline("fourier_transform_2D_3D.gif", duration=120,
+                   dpi=150) as pipeline:
+    for i in range(steps):
+        alpha = i / (steps - 1)
+
+        fig = plt.figure(figsize=(14, 6))
+
+        # --- Left subplot: 2D plots ---
+        ax1 = fig.add_subplot(121)
+        ax1.plot(t, signal, color='blue', lw=3, alpha=1 - alpha, label="Time Domain")
+        ax1.plot(freq[:len(freq)//2], spectrum[:len(freq)//2],
+                 color='red', lw=2, alpha=alpha, label="Frequency Domain")
+        ax1.set_title("2D Comparison", fontsize=14, fontweight='bold')
+        ax1.set_xlabel("Time / Frequency")
+        ax1.set_ylabel("Amplitude / Magnitude")
+        ax1.set_ylim(-2.5, 2.5)
+        ax1.set_xlim(0, 12)
+        ax1.legend(fontsize=15)
+        ax1.grid(True, linestyle='--', alpha=0.6)
+
+        # --- Right subplot: 3D plot ---
+        ax2 = fig.add_subplot(122, projection='3d')
+        ax2.plot(t, signal * 2, zs=-2, zdir='y',
+                 color='blue', alpha=1 - alpha, lw=2, label="Time Domain")
+        ax2.bar(freq[:len(freq)//2], spectrum[:len(freq)//2],
+                zs=2, zdir='y', color='red', alpha=alpha*0.8,
+                edgecolor='black', linewidth=0.8, label="Frequency Domain")
+        ax2.set_title("3D Transition", fontsize=14, fontweight='bold')
+        ax2.set_xlabel("Time / Frequency", fontsize=12)
+        ax2.set_ylim(-2.5, 2.5)
+        ax2.set_xlim(0, 12) 
+        ax2.set_ylabel("Domain", fontsize=12)
+        ax2.set_zlabel("Amplitude / Magnitude", fontsize=12)
+        ax2.view_init(elev=25, azim=30 + i)
+        ax2.legend(loc="upper left", fontsize=15)
+
+        plt.tight_layout()
+        pipeline.add(fig)
+        plt.close()
 
 print("GIF saved as fourier_transform_2D_3D.gif")
 
@@ -83,74 +66,156 @@ print("GIF saved as fourier_transform_2D_3D.gif")
 
 import numpy as np
 import matplotlib.pyplot as plt
-from PIL import Image
-import os
-
-# Create temporary folder
-os.makedirs("frames", exist_ok=True)
+from scipy.optimize import minimize_scalar
+from scipy.special import polygamma
+from frame_pipeline import FramePipeline
 
 # Square wave definition
 def square_wave(t):
     return np.sign(np.sin(t))
 
+# Coefficients 4/(pi*k) of the odd harmonics k = 1, 3, ..., N
+def harmonic_coefficients(N, sigma=False):
+    k = np.arange(1, N+1, 2, dtype=np.float64)
+    c = (4/np.pi) * (1/k)
+    if sigma:
+        c = (1 - k/(N+1)) * (4/np.pi) * (1/k)  # Fejér kernel weighting
+    return k, c
+
+# Synthesis kernel: out = sum_k c_k * sin(k*t), computed in `dtype`.
+# `out` and `work` are optional caller-owned buffers of shape t.shape; when
+# both are given the loop runs entirely with in-place ufuncs and allocates
+# no arrays.  k*t is formed in float64 and rounded once into `work`.
+#
+# float32 accuracy: against the float64 sum, with u = 2**-24,
+#   |err| <= u * ((N+1) * (2*max|t|/pi + 3) + 8*(1 + ln N))
+# (phase rounding of k*t, sin/product rounding per term and accumulation
+# of (N+1)/2 partial sums).  See float32_error_bound().
+def synthesize(t, N, sigma=False, dtype=np.float64, out=None, work=None):
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}")
+    if out is None:
+        out = np.empty(np.shape(t), dtype=dtype)
+    if work is None:
+        work = np.empty_like(out)
+    if out.dtype != dtype or work.dtype != dtype:
+        raise ValueError("out and work must match the requested dtype")
+
+    k, c = harmonic_coefficients(N, sigma)
+    out.fill(0)
+    for kk, ck in zip(k, c.astype(dtype)):
+        np.multiply(t, kk, out=work, casting="same_kind")
+        np.sin(work, out=work)
+        np.multiply(work, ck, out=work)
+        np.add(out, work, out=out)
+    return out
+
+# A priori bound on |float32 sum - float64 sum| for the kernel above
+def float32_error_bound(t, N):
+    u = np.finfo(np.float32).eps / 2
+    tmax = np.max(np.abs(t))
+    return u * ((N+1) * (2*tmax/np.pi + 3) + 8*(1 + np.log(max(N, 1))))
+
 # Fourier series approximation of square wave
-def fourier_series(t, N):
-    result = np.zeros_like(t)
-    for k in range(1, N+1, 2):  # odd harmonics only
-        result += (4/np.pi) * (1/k) * np.sin(k*t)
-    return result
+def fourier_series(t, N, dtype=np.float64, out=None, work=None):
+    return synthesize(t, N, sigma=False, dtype=dtype, out=out, work=work)
 
 # Sigma approximation (Cesàro sum)
-def sigma_approx(t, N):
-    result = np.zeros_like(t)
-    for k in range(1, N+1, 2):
-        weight = 1 - k/(N+1)  # Fejér kernel weighting
-        result += weight * (4/np.pi) * (1/k) * np.sin(k*t)
-    return result
+def sigma_approx(t, N, dtype=np.float64, out=None, work=None):
+    return synthesize(t, N, sigma=True, dtype=dtype, out=out, work=work)
+
+# ----------------------------------------------------
+# Convergence metrics (no full-grid evaluation)
+# ----------------------------------------------------
+
+# RMS error over one period, from the coefficients via Parseval:
+#   mean (f - S)^2 = 1/2 * sum_k (b_k - a_k)^2,  b_k = 4/(pi*k) for odd k.
+# The tail k > N (a_k = 0) is summed in closed form with the trigamma
+# function, sum_{j>=m} 1/(2j+1)^2 = psi'(m + 1/2)/4, so the cost is O(N).
+def l2_error(N, sigma=False):
+    k, c = harmonic_coefficients(N, sigma)
+    b = (4/np.pi) * (1/k)
+    head = np.sum((b - c)**2)
+    tail = (16/np.pi**2) * polygamma(1, len(k) + 0.5) / 4
+    return np.sqrt(0.5*(head + tail))
+
+# Peak of the partial sum, found with a bounded Brent search.
+# The plain sum has its first maximum at pi/(N+1), next to the jump at
+# t = 0; searching [pi/(2(N+1)), 2pi/(N+1)] locates it to machine precision
+# (for small N the lobe can reach pi/2, which is compared as well).
+# The Fejér-weighted sum is the Fejér mean of order M = N+1: it has no
+# lobe at the jump and stays below 1, so its "overshoot" is negative (the
+# shortfall below 1).  It is symmetric about pi/2 and peaks at pi/2 for
+# N not divisible by 4; otherwise the peak lies within pi/M of pi/2, so
+# [pi/2 - 2pi/M, pi/2] is scanned coarsely and the best cell refined.
+# Returns (t_peak, overshoot) with overshoot = max S - 1.
+def gibbs_peak(N, sigma=False):
+    k, c = harmonic_coefficients(N, sigma)
+    S = lambda t0: np.dot(c, np.sin(k*t0))  # O(N) point evaluation
+
+    if sigma:
+        grid = np.linspace(max(np.pi/2 - 2*np.pi/(N+1), 0), np.pi/2, 9)
+        i = np.argmax([S(t0) for t0 in grid])
+        lo, hi = grid[max(i-1, 0)], grid[min(i+1, len(grid)-1)]
+    else:
+        lo, hi = np.pi/(2*(N+1)), min(2*np.pi/(N+1), np.pi/2)
+    res = minimize_scalar(lambda t0: -S(t0), bounds=(lo, hi),
+                          method="bounded", options={"xatol": 1e-9*lo})
+    t_peak, peak = res.x, -res.fun
+    if S(np.pi/2) > peak:
+        t_peak, peak = np.pi/2, S(np.pi/2)
+    return t_peak, peak - 1
+
+# Rows of (N, L2 Fourier, L2 sigma, overshoot Fourier, overshoot sigma);
+# the sigma column is negative, the shortfall of the peak below 1
+def convergence_table(Ns):
+    return [(N, l2_error(N), l2_error(N, sigma=True),
+             gibbs_peak(N)[1], gibbs_peak(N, sigma=True)[1]) for N in Ns]
 
 # Time axis
 t = np.linspace(0, 2*np.pi, 2000)
 signal = square_wave(t)
 
-frames = []
-steps = 40  # number of frames
+# Synthesis precision (np.float32 halves memory traffic, see bound above)
+dtype = np.float64
 
-for i in range(1, steps+1):
-    fig, ax = plt.subplots(figsize=(12,8))
+# Buffers reused by every frame
+fs = np.empty(t.shape, dtype=dtype)
+sa = np.empty(t.shape, dtype=dtype)
+work = np.empty(t.shape, dtype=dtype)
 
-    # Original square wave
-    ax.plot(t, signal, 'r', linewidth=2, label="Square wave")
-
-    # Fourier series approximation
-    fs = fourier_series(t, i*2-1)
-    ax.plot(t, fs, 'b', linewidth=2, label=f"Fourier series (N={i*2-1})")
+steps = 40  # number of frames
 
-    # Sigma approximation
-    sa = sigma_approx(t, i*2-1)
-    ax.plot(t, sa, 'g', linewidth=2, label=f"Sigma approximation (N={i*2-1})")
-    ax.tick_params(axis='both', which='major', labelsize=14)
-    ax.set_xlim(0, 2*np.pi)
+with FramePipeline("square_wave_approximation.gif", duration=200) as pipeline:
+    for i in range(1, steps+1):
+        fig, ax = plt.subplots(figsize=(12,8))
 
-    ax.set_ylim(-1.5, 1.5)
-    ax.set_title("Square Wave Approximation: Fourier vs Sigma")
-    ax.legend(loc="upper right", fontsize=15)
+        # Original square wave
+        ax.plot(t, signal, 'r', linewidth=2, label="Square wave")
 
-    filename = f"frames/frame_{i:03d}.png"
-    plt.savefig(filename)
-    plt.close()
+        # Fourier series approximation
+        fourier_series(t, i*2-1, dtype=dtype, out=fs, work=work)
+        ax.plot(t, fs, 'b', linewidth=2, label=f"Fourier series (N={i*2-1})")
 
-    frames.append(Image.open(filename))
+        # Sigma approximation
+        sigma_approx(t, i*2-1, dtype=dtype, out=sa, work=work)
+        ax.plot(t, sa, 'g', linewidth=2, label=f"Sigma approximation (N={i*2-1})")
+        ax.tick_params(axis='both', which='major', labelsize=14)
+        ax.set_xlim(0, 2*np.pi)
 
-# Save GIF
-frames[0].save("square_wave_approximation.gif",
-               save_all=True,
-               append_images=frames[1:],
-               duration=200,
-               loop=0)
+        ax.set_ylim(-1.5, 1.5)
+        ax.set_title("Square Wave Approximation: Fourier vs Sigma")
+        ax.legend(loc="upper right", fontsize=15)
 
-# Cleanup
-for file in os.listdir("frames"):
-    os.remove(os.path.join("frames", file))
-os.rmdir("frames")
+        pipeline.add(fig)
+        plt.close()
 
 print("GIF saved as square_wave_approximation.gif")
+
+# Convergence of both approximations
+# (sigma never overshoots: its column is the shortfall below 1, i.e. < 0)
+print(f"{'N':>8} {'L2 Fourier':>12} {'L2 sigma':>12} "
+      f"{'overshoot F':>12} {'sigma max-1':>12}")
+for row in convergence_table([1, 9, 99, 999, 9999, 99999, 999999]):
+    print("{:>8d} {:>12.3e} {:>12.3e} {:>12.5f} {:>12.3e}".format(*row))